@@ -1,5 +1,7 @@
 import streamlit as st
 import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -22,15 +24,99 @@ st.markdown("""
     """, unsafe_allow_html=True)
 
 # Database connection
+def tune_connection(conn):
+    conn.execute("PRAGMA cache_size=-200000")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA temp_store=MEMORY")
+
 @st.cache_resource
 def get_connection():
-    return sqlite3.connect('fifa_stats.db', check_same_thread=False)
+    conn = sqlite3.connect('fifa_stats.db', check_same_thread=False)
+    tune_connection(conn)
+    # The dashboard never writes; indexes and statistics are built by the ETL
+    conn.execute("PRAGMA query_only=1")
+    return conn
+
+@st.cache_resource
+def get_query_pool():
+    # A sqlite3 connection runs one statement at a time, so every worker
+    # thread opens its own read-only connection
+    readers = threading.local()
+
+    def open_reader():
+        readers.conn = sqlite3.connect('file:fifa_stats.db?mode=ro', uri=True)
+        tune_connection(readers.conn)
+
+    return ThreadPoolExecutor(max_workers=4, initializer=open_reader), readers
+
+# Low-cardinality text columns are stored as categoricals (int codes + one string table)
+CATEGORY_COLUMNS = {'Position', 'Club', 'Nationality', 'PreferredFoot'}
+
+def with_categories(df):
+    for col in CATEGORY_COLUMNS.intersection(df.columns):
+        df[col] = df[col].astype('category')
+    return df
+
+def query_frame(conn, query, params=()):
+    # Build the frame straight from the cursor rows, skipping read_sql_query's per-column coercion
+    cur = conn.execute(query, params)
+    df = pd.DataFrame.from_records(cur.fetchall(), columns=[col[0] for col in cur.description])
+    return with_categories(df)
+
+@st.cache_data(ttl=600)
+def load_data(query, params=()):
+    return query_frame(get_connection(), query, params)
 
 @st.cache_data(ttl=600)
-def load_data(query):
+def load_data_many(queries):
+    # Run independent queries concurrently; wall time is the slowest query, not the sum
+    pool, readers = get_query_pool()
+    futures = {
+        key: pool.submit(lambda q: query_frame(readers.conn, *q), query)
+        for key, query in queries.items()
+    }
+    return {key: future.result() for key, future in futures.items()}
+
+@st.cache_data(ttl=600)
+def load_row(query, params=()):
     conn = get_connection()
-    df = pd.read_sql_query(query, conn)
-    return df
+    return conn.execute(query, params).fetchone()
+
+@st.cache_data(ttl=600)
+def load_kpis(filter_clause, params=()):
+    conn = get_connection()
+    cur = conn.execute(f"""
+        SELECT 
+            COUNT(*),
+            ROUND(AVG(Overall), 1),
+            ROUND(AVG(Age), 1),
+            COUNT(DISTINCT Club),
+            (SELECT Name FROM players {filter_clause} ORDER BY Overall DESC LIMIT 1),
+            MAX(Overall)
+        FROM players {filter_clause}
+    """, params * 2)
+    return cur.fetchone()
+
+@st.cache_data(ttl=600)
+def load_filtered(filter_clause, params=()):
+    return query_frame(get_connection(), f"""
+        SELECT Overall, Age, Nationality, Club, Position, Name, Potential
+        FROM players {filter_clause}
+    """, params)
+
+@st.cache_data(ttl=None, show_spinner=False)
+def get_positions():
+    rows = get_connection().execute(
+        "SELECT DISTINCT Position FROM players WHERE Position != '' ORDER BY Position"
+    ).fetchall()
+    return [row[0] for row in rows]
+
+@st.cache_data(ttl=None, show_spinner=False)
+def get_clubs():
+    rows = get_connection().execute(
+        "SELECT DISTINCT Club FROM players WHERE Club != '' ORDER BY Club"
+    ).fetchall()
+    return [row[0] for row in rows]
 
 # Header
 st.title("⚽ FIFA Player Statistics Dashboard")
@@ -42,17 +128,17 @@ st.sidebar.header("🎮 Filters & Settings")
 st.sidebar.markdown("---")
 
 # Load basic data for filters
-positions_df = load_data("SELECT DISTINCT Position FROM players WHERE Position != '' ORDER BY Position")
-clubs_df = load_data("SELECT DISTINCT Club FROM players WHERE Club != '' ORDER BY Club")
+all_positions = get_positions()
+all_clubs = get_clubs()
 
 selected_position = st.sidebar.selectbox(
     "🎯 Position",
-    ["All"] + positions_df['Position'].tolist()
+    ["All"] + all_positions
 )
 
 selected_club = st.sidebar.selectbox(
     "🏆 Club", 
-    ["All"] + clubs_df['Club'].head(50).tolist()
+    ["All"] + all_clubs[:50]
 )
 
 min_rating, max_rating = st.sidebar.slider(
@@ -65,62 +151,64 @@ min_age, max_age = st.sidebar.slider(
     16, 45, (18, 35)
 )
 
-# Build filter query
-filter_clause = f"WHERE Overall BETWEEN {min_rating} AND {max_rating} AND Age BETWEEN {min_age} AND {max_age}"
+# Build filter query (bound values only, so the SQL text is one of four fixed variants)
+filter_clause = "WHERE Overall BETWEEN ? AND ? AND Age BETWEEN ? AND ?"
+filter_params = (min_rating, max_rating, min_age, max_age)
 if selected_position != "All":
-    filter_clause += f" AND Position = '{selected_position}'"
+    filter_clause += " AND Position = ?"
+    filter_params += (selected_position,)
 if selected_club != "All":
-    filter_clause += f" AND Club = '{selected_club}'"
+    filter_clause += " AND Club = ?"
+    filter_params += (selected_club,)
 
 # KPI Metrics
 col1, col2, col3, col4, col5 = st.columns(5)
 
 try:
+    total_count, avg_val, age_val, clubs_count, top_name, top_overall = load_kpis(filter_clause, filter_params)
+
     with col1:
-        total = load_data(f"SELECT COUNT(*) as count FROM players {filter_clause}")
-        total_count = total['count'].iloc[0] if not total.empty else 0
         st.metric("👥 Total Players", f"{total_count:,}")
 
     with col2:
-        avg_rating = load_data(f"SELECT ROUND(AVG(Overall), 1) as avg FROM players {filter_clause}")
-        avg_val = avg_rating['avg'].iloc[0] if not avg_rating.empty and pd.notna(avg_rating['avg'].iloc[0]) else 0
-        st.metric("⭐ Avg Rating", f"{avg_val}")
+        st.metric("⭐ Avg Rating", f"{avg_val if avg_val is not None else 0}")
 
     with col3:
-        avg_age = load_data(f"SELECT ROUND(AVG(Age), 1) as avg FROM players {filter_clause}")
-        age_val = avg_age['avg'].iloc[0] if not avg_age.empty and pd.notna(avg_age['avg'].iloc[0]) else 0
-        st.metric("👤 Avg Age", f"{age_val}")
+        st.metric("👤 Avg Age", f"{age_val if age_val is not None else 0}")
 
     with col4:
-        top_player = load_data(f"SELECT Name, Overall FROM players {filter_clause} ORDER BY Overall DESC LIMIT 1")
-        if not top_player.empty:
-            st.metric("🏆 Top Player", top_player['Name'].iloc[0], f"{top_player['Overall'].iloc[0]}")
+        if top_name is not None:
+            st.metric("🏆 Top Player", top_name, f"{top_overall}")
         else:
             st.metric("🏆 Top Player", "N/A", "0")
 
     with col5:
-        clubs = load_data(f"SELECT COUNT(DISTINCT Club) as count FROM players {filter_clause}")
-        clubs_count = clubs['count'].iloc[0] if not clubs.empty else 0
         st.metric("🏟️ Clubs", f"{clubs_count}")
 except Exception as e:
     st.error(f"Error loading metrics: {e}")
 
 st.markdown("---")
 
-# Tabs
-tab1, tab2, tab3, tab4 = st.tabs(["📊 Overview", "🏆 Top Players", "⚽ Best XI", "🏟️ Club Analysis"])
+# Sections (only the selected section is rendered, so only its queries run)
+active_tab = st.radio(
+    "Section",
+    ["📊 Overview", "🏆 Top Players", "⚽ Best XI", "🏟️ Club Analysis",
+     "📈 Skill Analysis", "🔍 Player Search", "🎯 Position Deep Dive"],
+    key="active_tab",
+    horizontal=True,
+    label_visibility="collapsed"
+)
+st.markdown("---")
 
-with tab1:
+def render_overview(filter_clause, filter_params):
+    # One filtered slice feeds every Overview chart
+    players_df = load_filtered(filter_clause, filter_params)
+    
     col1, col2 = st.columns(2)
     
     with col1:
         st.subheader("📊 Rating Distribution")
-        rating_dist = load_data(f"""
-            SELECT Overall, COUNT(*) as count 
-            FROM players {filter_clause}
-            GROUP BY Overall 
-            ORDER BY Overall
-        """)
+        rating_dist = players_df.groupby('Overall').size().reset_index(name='count')
         fig = px.area(rating_dist, x='Overall', y='count',
                      title='Player Rating Distribution',
                      labels={'count': 'Number of Players'},
@@ -130,13 +218,11 @@ with tab1:
     
     with col2:
         st.subheader("🌍 Top 15 Nationalities")
-        nations = load_data(f"""
-            SELECT Nationality, COUNT(*) as count, ROUND(AVG(Overall), 1) as avg_rating
-            FROM players {filter_clause}
-            GROUP BY Nationality 
-            ORDER BY count DESC 
-            LIMIT 15
-        """)
+        nations = (players_df.groupby('Nationality', observed=True)
+                   .agg(count=('Overall', 'size'), avg_rating=('Overall', 'mean'))
+                   .nlargest(15, 'count')
+                   .round({'avg_rating': 1})
+                   .reset_index())
         fig = px.bar(nations, x='Nationality', y='count',
                     title='Players by Nationality',
                     color='avg_rating',
@@ -149,12 +235,7 @@ with tab1:
     
     with col1:
         st.subheader("👥 Age Distribution")
-        age_dist = load_data(f"""
-            SELECT Age, COUNT(*) as count 
-            FROM players {filter_clause}
-            GROUP BY Age 
-            ORDER BY Age
-        """)
+        age_dist = players_df.groupby('Age').size().reset_index(name='count')
         fig = px.line(age_dist, x='Age', y='count',
                      title='Players by Age',
                      markers=True,
@@ -164,13 +245,12 @@ with tab1:
     
     with col2:
         st.subheader("🏟️ Top 15 Clubs")
-        clubs = load_data(f"""
-            SELECT Club, COUNT(*) as count, ROUND(AVG(Overall), 1) as avg_rating
-            FROM players {filter_clause} AND Club != 'Hoffenheim' AND Club != ''
-            GROUP BY Club 
-            ORDER BY count DESC 
-            LIMIT 15
-        """)
+        club_players = players_df[~players_df['Club'].isin(['Hoffenheim', ''])]
+        clubs = (club_players.groupby('Club', observed=True)
+                 .agg(count=('Overall', 'size'), avg_rating=('Overall', 'mean'))
+                 .nlargest(15, 'count')
+                 .round({'avg_rating': 1})
+                 .reset_index())
         fig = px.bar(clubs, x='Club', y='count',
                     title='Players by Club',
                     color='avg_rating',
@@ -179,7 +259,7 @@ with tab1:
         fig.update_layout(template='plotly_dark', xaxis_tickangle=-45, height=400)
         st.plotly_chart(fig, use_container_width=True)
 
-with tab2:
+def render_top_players(filter_clause, filter_params):
     st.subheader("🏆 Top 50 Players")
     
     top_players = load_data(f"""
@@ -188,7 +268,7 @@ with tab2:
         FROM players {filter_clause}
         ORDER BY Overall DESC 
         LIMIT 50
-    """)
+    """, filter_params)
     
     st.dataframe(
         top_players,
@@ -196,129 +276,173 @@ with tab2:
         height=600
     )
 
-with tab3:
+def render_best_xi():
     st.subheader("⚽ BEST XI - Dream Team")
     st.markdown("### 🏆 Formation: 4-3-3")
     
     try:
-        # Get best players by position
-        gk = load_data("SELECT Name, Overall, Club, Age FROM players WHERE Position = 'GK' ORDER BY Overall DESC LIMIT 1")
-        lb = load_data("SELECT Name, Overall, Club, Age FROM players WHERE Position IN ('LB', 'LWB') ORDER BY Overall DESC LIMIT 1")
-        cb1 = load_data("SELECT Name, Overall, Club, Age FROM players WHERE Position = 'CB' ORDER BY Overall DESC LIMIT 1")
-        cb2 = load_data("SELECT Name, Overall, Club, Age FROM players WHERE Position = 'CB' ORDER BY Overall DESC LIMIT 1 OFFSET 1")
-        rb = load_data("SELECT Name, Overall, Club, Age FROM players WHERE Position IN ('RB', 'RWB') ORDER BY Overall DESC LIMIT 1")
-        cm1 = load_data("SELECT Name, Overall, Club, Age FROM players WHERE Position IN ('CM', 'CDM') ORDER BY Overall DESC LIMIT 1")
-        cm2 = load_data("SELECT Name, Overall, Club, Age FROM players WHERE Position IN ('CM', 'CAM') ORDER BY Overall DESC LIMIT 1")
-        cm3 = load_data("SELECT Name, Overall, Club, Age FROM players WHERE Position IN ('CM', 'CDM', 'CAM') ORDER BY Overall DESC LIMIT 1 OFFSET 1")
-        lw = load_data("SELECT Name, Overall, Club, Age FROM players WHERE Position IN ('LW', 'LM') ORDER BY Overall DESC LIMIT 1")
-        striker = load_data("SELECT Name, Overall, Club, Age FROM players WHERE Position IN ('ST', 'CF') ORDER BY Overall DESC LIMIT 1")
-        rw = load_data("SELECT Name, Overall, Club, Age FROM players WHERE Position IN ('RW', 'RM') ORDER BY Overall DESC LIMIT 1")
+        # Get best players by position: one index seek per PositionBucket, all in one query
+        best_xi = load_data("""
+            WITH slots(PositionBucket, Slots) AS (
+                VALUES ('GK', 1), ('LB', 1), ('CB', 2), ('RB', 1),
+                       ('CM', 3), ('LW', 1), ('ST', 1), ('RW', 1)
+            ),
+            ranked AS (
+                SELECT s.PositionBucket, s.Slots, p.Name, p.Overall, p.Club, p.Age,
+                       ROW_NUMBER() OVER (PARTITION BY s.PositionBucket ORDER BY p.Overall DESC) as rn
+                FROM slots s
+                JOIN players p ON p.ID IN (
+                    SELECT ID FROM players
+                    WHERE PositionBucket = s.PositionBucket
+                    ORDER BY Overall DESC
+                    LIMIT 3
+                )
+            )
+            SELECT PositionBucket, rn, Name, Overall, Club, Age
+            FROM ranked
+            WHERE rn <= Slots
+        """)
+        lineup = {(row.PositionBucket, row.rn): row for row in best_xi.itertuples(index=False)}
+        gk = lineup.get(('GK', 1))
+        lb = lineup.get(('LB', 1))
+        cb1 = lineup.get(('CB', 1))
+        cb2 = lineup.get(('CB', 2))
+        rb = lineup.get(('RB', 1))
+        cm1 = lineup.get(('CM', 1))
+        cm2 = lineup.get(('CM', 2))
+        cm3 = lineup.get(('CM', 3))
+        lw = lineup.get(('LW', 1))
+        striker = lineup.get(('ST', 1))
+        rw = lineup.get(('RW', 1))
         
         # Forward line
         st.markdown("#### ⚔️ Attack")
         fcol1, fcol2, fcol3 = st.columns(3)
         with fcol1:
-            if not lw.empty:
-                st.info(f"**LW**: {lw['Name'].iloc[0]}\n\n⭐ {lw['Overall'].iloc[0]} | {lw['Club'].iloc[0]}")
+            if lw is not None:
+                st.info(f"**LW**: {lw.Name}\n\n⭐ {lw.Overall} | {lw.Club}")
         with fcol2:
-            if not striker.empty:
-                st.success(f"**ST**: {striker['Name'].iloc[0]}\n\n⭐ {striker['Overall'].iloc[0]} | {striker['Club'].iloc[0]}")
+            if striker is not None:
+                st.success(f"**ST**: {striker.Name}\n\n⭐ {striker.Overall} | {striker.Club}")
         with fcol3:
-            if not rw.empty:
-                st.info(f"**RW**: {rw['Name'].iloc[0]}\n\n⭐ {rw['Overall'].iloc[0]} | {rw['Club'].iloc[0]}")
+            if rw is not None:
+                st.info(f"**RW**: {rw.Name}\n\n⭐ {rw.Overall} | {rw.Club}")
         
         # Midfield line
         st.markdown("#### 🎯 Midfield")
         mcol1, mcol2, mcol3 = st.columns(3)
         with mcol1:
-            if not cm1.empty:
-                st.warning(f"**CM**: {cm1['Name'].iloc[0]}\n\n⭐ {cm1['Overall'].iloc[0]} | {cm1['Club'].iloc[0]}")
+            if cm1 is not None:
+                st.warning(f"**CM**: {cm1.Name}\n\n⭐ {cm1.Overall} | {cm1.Club}")
         with mcol2:
-            if not cm2.empty:
-                st.warning(f"**CM**: {cm2['Name'].iloc[0]}\n\n⭐ {cm2['Overall'].iloc[0]} | {cm2['Club'].iloc[0]}")
+            if cm2 is not None:
+                st.warning(f"**CM**: {cm2.Name}\n\n⭐ {cm2.Overall} | {cm2.Club}")
         with mcol3:
-            if not cm3.empty:
-                st.warning(f"**CM**: {cm3['Name'].iloc[0]}\n\n⭐ {cm3['Overall'].iloc[0]} | {cm3['Club'].iloc[0]}")
+            if cm3 is not None:
+                st.warning(f"**CM**: {cm3.Name}\n\n⭐ {cm3.Overall} | {cm3.Club}")
         
         # Defense line
         st.markdown("#### 🛡️ Defense")
         dcol1, dcol2, dcol3, dcol4 = st.columns(4)
         with dcol1:
-            if not lb.empty:
-                st.error(f"**LB**: {lb['Name'].iloc[0]}\n\n⭐ {lb['Overall'].iloc[0]} | {lb['Club'].iloc[0]}")
+            if lb is not None:
+                st.error(f"**LB**: {lb.Name}\n\n⭐ {lb.Overall} | {lb.Club}")
         with dcol2:
-            if not cb1.empty:
-                st.error(f"**CB**: {cb1['Name'].iloc[0]}\n\n⭐ {cb1['Overall'].iloc[0]} | {cb1['Club'].iloc[0]}")
+            if cb1 is not None:
+                st.error(f"**CB**: {cb1.Name}\n\n⭐ {cb1.Overall} | {cb1.Club}")
         with dcol3:
-            if not cb2.empty:
-                st.error(f"**CB**: {cb2['Name'].iloc[0]}\n\n⭐ {cb2['Overall'].iloc[0]} | {cb2['Club'].iloc[0]}")
+            if cb2 is not None:
+                st.error(f"**CB**: {cb2.Name}\n\n⭐ {cb2.Overall} | {cb2.Club}")
         with dcol4:
-            if not rb.empty:
-                st.error(f"**RB**: {rb['Name'].iloc[0]}\n\n⭐ {rb['Overall'].iloc[0]} | {rb['Club'].iloc[0]}")
+            if rb is not None:
+                st.error(f"**RB**: {rb.Name}\n\n⭐ {rb.Overall} | {rb.Club}")
         
         # Goalkeeper
         st.markdown("#### 🧤 Goalkeeper")
-        if not gk.empty:
-            st.success(f"**GK**: {gk['Name'].iloc[0]}\n\n⭐ {gk['Overall'].iloc[0]} | {gk['Club'].iloc[0]}")
+        if gk is not None:
+            st.success(f"**GK**: {gk.Name}\n\n⭐ {gk.Overall} | {gk.Club}")
         
         # Team statistics
         st.markdown("---")
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            all_players = pd.concat([gk, lb, cb1, cb2, rb, cm1, cm2, cm3, lw, striker, rw])
-            avg_overall = all_players['Overall'].mean() if not all_players.empty else 0
+            avg_overall = best_xi['Overall'].mean() if not best_xi.empty else 0
             st.metric("Team Average Rating", f"{avg_overall:.1f}")
         
         with col2:
-            avg_age = all_players['Age'].mean() if not all_players.empty else 0
+            avg_age = best_xi['Age'].mean() if not best_xi.empty else 0
             st.metric("Team Average Age", f"{avg_age:.1f}")
         
         with col3:
-            unique_clubs = all_players['Club'].nunique() if not all_players.empty else 0
+            unique_clubs = best_xi['Club'].nunique() if not best_xi.empty else 0
             st.metric("Clubs Represented", unique_clubs)
     
     except Exception as e:
         st.error(f"Error loading Best XI: {e}")
 
-with tab4:
+def render_club_analysis():
     st.subheader("🏟️ Club Analysis & Talent Index")
     
     try:
-        # Club talent analysis
-        club_talent = load_data("""
-            SELECT 
-                Club,
-                COUNT(*) as TotalPlayers,
-                ROUND(AVG(Overall), 2) as AvgRating,
-                MAX(Overall) as BestPlayer,
-                ROUND(AVG(Potential), 2) as AvgPotential,
-                COUNT(CASE WHEN Age <= 23 THEN 1 END) as YoungTalents,
-                COUNT(CASE WHEN Overall >= 80 THEN 1 END) as WorldClass,
-                ROUND(AVG(CASE WHEN Age <= 23 THEN Potential ELSE 0 END), 2) as YouthPotential
-            FROM players
-            WHERE Club != '' AND Club IS NOT NULL AND Club != 'Hoffenheim'
-            GROUP BY Club
-            HAVING TotalPlayers >= 15
-            ORDER BY AvgRating DESC
-            LIMIT 30
-        """)
+        # Club talent, youth academy and hidden gem queries are independent
+        tables = load_data_many({
+            'club_talent': ("""
+                SELECT 
+                    Club,
+                    COUNT(*) as TotalPlayers,
+                    ROUND(AVG(Overall), 2) as AvgRating,
+                    MAX(Overall) as BestPlayer,
+                    ROUND(AVG(Potential), 2) as AvgPotential,
+                    COUNT(CASE WHEN Age <= 23 THEN 1 END) as YoungTalents,
+                    COUNT(CASE WHEN Overall >= 80 THEN 1 END) as WorldClass,
+                    ROUND(AVG(CASE WHEN Age <= 23 THEN Potential ELSE 0 END), 2) as YouthPotential,
+                    -- Talent Index (weighted score)
+                    ROUND(AVG(Overall) * 0.4 +
+                          AVG(Potential) * 0.3 +
+                          COUNT(CASE WHEN Age <= 23 THEN 1 END) * 2 +
+                          COUNT(CASE WHEN Overall >= 80 THEN 1 END) * 1.5, 2) as TalentIndex
+                FROM players
+                WHERE Club != '' AND Club IS NOT NULL AND Club != 'Hoffenheim'
+                GROUP BY Club
+                HAVING TotalPlayers >= 15
+                ORDER BY AvgRating DESC
+                LIMIT 30
+            """, ()),
+            'youth_clubs': ("""
+                SELECT 
+                    Club,
+                    COUNT(*) as YoungPlayers,
+                    ROUND(AVG(Overall), 1) as AvgRating,
+                    ROUND(AVG(Potential), 1) as AvgPotential,
+                    MAX(Potential) as BestPotential
+                FROM players
+                WHERE Age <= 23 AND Club != '' AND Club != 'Hoffenheim'
+                GROUP BY Club
+                HAVING YoungPlayers >= 5
+                ORDER BY AvgPotential DESC
+                LIMIT 15
+            """, ()),
+            'gems': ("""
+                SELECT Name, Age, Club, Overall, Potential, Growth
+                FROM players
+                WHERE Growth >= 15 AND Age <= 24
+                ORDER BY Growth DESC
+                LIMIT 20
+            """, ()),
+        })
+        club_talent = tables['club_talent']
+        youth_clubs = tables['youth_clubs']
+        gems = tables['gems']
         
         if not club_talent.empty:
-            # Calculate Talent Index (weighted score)
-            club_talent['TalentIndex'] = (
-                club_talent['AvgRating'] * 0.4 + 
-                club_talent['AvgPotential'] * 0.3 + 
-                club_talent['YoungTalents'] * 2 + 
-                club_talent['WorldClass'] * 1.5
-            ).round(2)
-            club_talent = club_talent.sort_values('TalentIndex', ascending=False)
+            club_talent = club_talent.nlargest(20, 'TalentIndex')
             
             col1, col2 = st.columns([2, 1])
             
             with col1:
                 st.markdown("### 🏆 Top 20 Clubs by Talent Index")
-                fig = px.bar(club_talent.head(20), 
+                fig = px.bar(club_talent, 
                              x='Club', y='TalentIndex',
                              color='AvgRating',
                              title='Club Talent Index (Quality + Potential + Youth)',
@@ -346,21 +470,6 @@ with tab4:
         
         with col1:
             st.markdown("### 🌟 Best Youth Academies (U23 Talent)")
-            youth_clubs = load_data("""
-                SELECT 
-                    Club,
-                    COUNT(*) as YoungPlayers,
-                    ROUND(AVG(Overall), 1) as AvgRating,
-                    ROUND(AVG(Potential), 1) as AvgPotential,
-                    MAX(Potential) as BestPotential
-                FROM players
-                WHERE Age <= 23 AND Club != '' AND Club != 'Hoffenheim'
-                GROUP BY Club
-                HAVING YoungPlayers >= 5
-                ORDER BY AvgPotential DESC
-                LIMIT 15
-            """)
-            
             if not youth_clubs.empty:
                 fig = px.scatter(youth_clubs, 
                                 x='AvgRating', y='AvgPotential',
@@ -375,13 +484,6 @@ with tab4:
         
         with col2:
             st.markdown("### 💎 Hidden Gems (High Potential, Low Current)")
-            gems = load_data("""
-                SELECT Name, Age, Club, Overall, Potential, (Potential - Overall) as Growth
-                FROM players
-                WHERE (Potential - Overall) >= 15 AND Age <= 24
-                ORDER BY Growth DESC
-                LIMIT 20
-            """)
             if not gems.empty:
                 st.dataframe(gems, use_container_width=True, height=400)
             else:
@@ -395,6 +497,7 @@ with tab4:
             depth_clubs = club_talent.head(5)['Club'].tolist()
             
             if depth_clubs:
+                placeholders = ','.join('?' * len(depth_clubs))
                 depth_data = load_data(f"""
                     SELECT 
                         Club,
@@ -402,9 +505,9 @@ with tab4:
                         COUNT(*) as Players,
                         ROUND(AVG(Overall), 1) as AvgRating
                     FROM players
-                    WHERE Club IN ('{"','".join(depth_clubs)}')
+                    WHERE Club IN ({placeholders})
                     GROUP BY Club, Position
-                """)
+                """, tuple(depth_clubs))
                 
                 if not depth_data.empty:
                     fig = px.bar(depth_data, 
@@ -418,25 +521,44 @@ with tab4:
     except Exception as e:
         st.error(f"Error in club analysis: {e}")
 
-
+def render_skill_analysis(filter_clause, filter_params):
     st.subheader("📈 Skill Analysis")
     
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("**⚔️ Attack vs Defense Skills**")
-        skills = load_data(f"""
-            SELECT 
-                Name,
-                Position,
-                Overall,
-                ROUND((Finishing + ShotPower + LongShots + Volleys + Penalties) / 5.0, 1) as AttackSkill,
-                ROUND((Marking + StandingTackle + SlidingTackle + Interceptions) / 4.0, 1) as DefenseSkill
+    skill_columns = """
+        Name,
+        Position,
+        Overall,
+        ROUND((Finishing + ShotPower + LongShots + Volleys + Penalties) / 5.0, 1) as AttackSkill,
+        ROUND((Marking + StandingTackle + SlidingTackle + Interceptions) / 4.0, 1) as DefenseSkill,
+        ROUND((Acceleration + SprintSpeed + Agility) / 3.0, 1) as Speed,
+        ROUND((Strength + Jumping + Stamina) / 3.0, 1) as Power
+    """
+    # One round trip for both scatter plots: the top 100 overall (physical chart) and
+    # the top 100 outfield players (attack vs defense), each half an index-driven LIMIT
+    skill_players = load_data(f"""
+        SELECT *, 0 as OutfieldOnly FROM (
+            SELECT {skill_columns}
+            FROM players 
+            {filter_clause}
+            ORDER BY Overall DESC
+            LIMIT 100
+        )
+        UNION ALL
+        SELECT *, 1 as OutfieldOnly FROM (
+            SELECT {skill_columns}
             FROM players 
             {filter_clause} AND Position != 'GK'
             ORDER BY Overall DESC
             LIMIT 100
-        """)
+        )
+    """, filter_params * 2)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("**⚔️ Attack vs Defense Skills**")
+        skills = skill_players.loc[skill_players['OutfieldOnly'] == 1,
+                                   ['Name', 'Position', 'Overall', 'AttackSkill', 'DefenseSkill']]
         
         fig = px.scatter(skills, x='AttackSkill', y='DefenseSkill',
                         size='Overall', color='Position',
@@ -448,18 +570,8 @@ with tab4:
     
     with col2:
         st.markdown("**🏃 Physical Attributes**")
-        physical = load_data(f"""
-            SELECT 
-                Name,
-                Position,
-                Overall,
-                ROUND((Acceleration + SprintSpeed + Agility) / 3.0, 1) as Speed,
-                ROUND((Strength + Jumping + Stamina) / 3.0, 1) as Power
-            FROM players 
-            {filter_clause}
-            ORDER BY Overall DESC
-            LIMIT 100
-        """)
+        physical = skill_players.loc[skill_players['OutfieldOnly'] == 0,
+                                     ['Name', 'Position', 'Overall', 'Speed', 'Power']]
         
         fig = px.scatter(physical, x='Speed', y='Power',
                         size='Overall', color='Position',
@@ -471,7 +583,7 @@ with tab4:
     
     st.markdown("**🎯 Position Comparison**")
     position_comparison = load_data("""
-        SELECT * FROM position_stats ORDER BY AvgRating DESC
+        SELECT * FROM position_stats_mv ORDER BY AvgRating DESC
     """)
     
     col1, col2 = st.columns([2, 1])
@@ -488,7 +600,10 @@ with tab4:
     with col2:
         st.dataframe(position_comparison, use_container_width=True, height=400)
 
-with tab4:
+# Sections with their own widgets run as fragments: typing a search or picking a
+# position reruns just that section, not the sidebar, KPIs or other charts
+@st.fragment
+def render_player_search():
     st.subheader("🔍 Player Search")
     
     col1, col2 = st.columns([2, 1])
@@ -499,16 +614,19 @@ with tab4:
     with col2:
         search_type = st.radio("Search in:", ["Name", "Club", "Nationality"])
     
-    if search_term:
-        search_column = search_type
-        results = load_data(f"""
-            SELECT ID, Name, Age, Nationality, Overall, Potential, Club, Position, 
-                   Height, Weight, PreferredFoot, Value, Wage
-            FROM players 
-            WHERE {search_column} LIKE '%{search_term}%'
-            ORDER BY Overall DESC
+    if search_term.strip():
+        # Quote every word as an FTS5 prefix term so user input can't inject query syntax
+        terms = " ".join('"' + word.replace('"', '""') + '"*' for word in search_term.split())
+        match_expr = f"{search_type} : ({terms})"
+        results = load_data("""
+            SELECT p.ID, p.Name, p.Age, p.Nationality, p.Overall, p.Potential, p.Club, p.Position, 
+                   p.Height, p.Weight, p.PreferredFoot, p.Value, p.Wage
+            FROM players_fts
+            JOIN players p ON p.ID = players_fts.rowid
+            WHERE players_fts MATCH ?
+            ORDER BY p.Overall DESC
             LIMIT 100
-        """)
+        """, (match_expr,))
         
         if len(results) > 0:
             st.write(f"Found **{len(results)}** results")
@@ -520,36 +638,46 @@ with tab4:
         else:
             st.warning("No players found matching your search criteria.")
 
-
+@st.fragment
+def render_position_deep_dive(positions):
     st.subheader("🎯 Position Deep Dive")
     
-    selected_pos = st.selectbox("Select Position:", positions_df['Position'].tolist())
+    selected_pos = st.selectbox("Select Position:", positions)
     
-    pos_players = load_data(f"""
-        SELECT Name, Age, Nationality, Overall, Potential, Club,
-               Crossing, Finishing, HeadingAccuracy, ShortPassing, Dribbling,
-               BallControl, Acceleration, SprintSpeed, Strength, Stamina
+    pos_attributes = ['Crossing', 'Finishing', 'HeadingAccuracy',
+                      'ShortPassing', 'Dribbling', 'BallControl',
+                      'Acceleration', 'SprintSpeed', 'Strength', 'Stamina']
+    
+    pos_players = load_data("""
+        SELECT Name, Club, Overall
         FROM players 
-        WHERE Position = '{selected_pos}'
+        WHERE Position = ?
         ORDER BY Overall DESC
-        LIMIT 30
-    """)
+        LIMIT 10
+    """, (selected_pos,))
+    
+    # Average the top 30 in SQLite and read back a single row
+    avg_stats = load_row(f"""
+        SELECT {', '.join(f'AVG({attr})' for attr in pos_attributes)}
+        FROM (
+            SELECT {', '.join(pos_attributes)}
+            FROM players 
+            WHERE Position = ?
+            ORDER BY Overall DESC
+            LIMIT 30
+        )
+    """, (selected_pos,))
     
     col1, col2 = st.columns([1, 2])
     
     with col1:
         st.markdown(f"**Top 10 {selected_pos} Players**")
-        top_10 = pos_players[['Name', 'Club', 'Overall']].head(10)
-        st.dataframe(top_10, use_container_width=True, height=400)
+        st.dataframe(pos_players, use_container_width=True, height=400)
     
     with col2:
         st.markdown(f"**{selected_pos} Key Attributes**")
-        avg_stats = pos_players[['Crossing', 'Finishing', 'HeadingAccuracy', 
-                                 'ShortPassing', 'Dribbling', 'BallControl',
-                                 'Acceleration', 'SprintSpeed', 'Strength', 'Stamina']].mean()
-        
         fig = go.Figure(data=[
-            go.Bar(x=avg_stats.index, y=avg_stats.values,
+            go.Bar(x=pos_attributes, y=list(avg_stats),
                   marker_color='lightblue')
         ])
         fig.update_layout(
@@ -560,6 +688,21 @@ with tab4:
         )
         st.plotly_chart(fig, use_container_width=True)
 
+if active_tab == "📊 Overview":
+    render_overview(filter_clause, filter_params)
+elif active_tab == "🏆 Top Players":
+    render_top_players(filter_clause, filter_params)
+elif active_tab == "⚽ Best XI":
+    render_best_xi()
+elif active_tab == "🏟️ Club Analysis":
+    render_club_analysis()
+elif active_tab == "📈 Skill Analysis":
+    render_skill_analysis(filter_clause, filter_params)
+elif active_tab == "🔍 Player Search":
+    render_player_search()
+elif active_tab == "🎯 Position Deep Dive":
+    render_position_deep_dive(all_positions)
+
 # Footer
 st.markdown("---")
 st.markdown("**Data Source:** FIFA EDA Stats Dataset | **Processing:** Shell Utilities + SQLite | **Visualization:** Streamlit + Plotly")